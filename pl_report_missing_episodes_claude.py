@@ -1,16 +1,26 @@
 #!/usr/bin/env python3
 import os
 import json
+import pickle
+import tempfile
 import sys
 import signal
+import logging
+import itertools
+import functools
+from collections import defaultdict, deque
 import time
-import unicodedata
 import re
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from plexapi.server import PlexServer
 import tvdb_v4_official
 import xlsxwriter
-from pathlib import Path
+
+try:
+    import orjson  # optional, much faster than the stdlib json module
+except ImportError:
+    orjson = None
 
 # Configuration - Replace these with your actual values
 PLEX_URL = "http://localhost:32400"  # Change to your Plex server URL
@@ -20,20 +30,44 @@ TVDB_APIKEY = ""  # Your TVDB API key
 # Cache settings
 CACHE_DIR = "./cache"
 CACHE_EXPIRY_DAYS = 30  # how long to cache the TVDB data
+TVDB_MAX_WORKERS = 8  # how many TVDB season requests to run at the same time
+SHOW_MAX_WORKERS = os.cpu_count() or 4  # how many shows to process at the same time
+TVDB_MAX_RETRIES = 4  # how many times to try a failed TVDB request, waiting 1, 2, 4.. seconds in between
+TVDB_MEMORY_CACHE_SIZE = 256  # how many shows to keep in memory when processing more than one library
 LIBRARY_TITLE_FILTER = re.compile("TV .*", re.IGNORECASE)  # filter show libraries that match the regex here
 
+# Cache files modified before this timestamp are expired
+CACHE_EXPIRY_CUTOFF = time.time() - CACHE_EXPIRY_DAYS * 86400
+
 # Ensure cache directory exists
 os.makedirs(CACHE_DIR, exist_ok=True)
 
-# Initialize workbook
-wb = xlsxwriter.Workbook("plex-episodes-report.xlsx")
+# Modification time of each cache file keyed by file name, read with a single directory scan and kept up to date on writes
+with os.scandir(CACHE_DIR) as cache_entries:
+    cache_mtimes = {entry.name: entry.stat().st_mtime for entry in cache_entries if entry.name.startswith("tvdb_") and entry.is_file()}
+
+# Initialize workbook, rows are streamed to disk so they must be written in increasing order on each sheet,
+# strings are always written as plain text (write_row would otherwise turn "=..." titles into formulas)
+wb = xlsxwriter.Workbook("plex-episodes-report.xlsx", {"constant_memory": True, "strings_to_urls": False, "strings_to_formulas": False})
 main_sheet = wb.add_worksheet("Episodes")
 not_found_sheet = wb.add_worksheet("TVNTF")
 error_sheet = wb.add_worksheet("TVERR")
 
+# Yields the next free row of each error sheet, the header is on row 0
+error_row_counters = {not_found_sheet: itertools.count(1), error_sheet: itertools.count(1)}
+
 # Define formats - only header is bold now
 header_format = wb.add_format({"bold": True})
 
+# Plex guids look like "tvdb://12345", captures the provider and its ID
+GUID_PATTERN = re.compile(r"^(tvdb|imdb|tmdb)://(.+)$")
+
+# Caps the concurrent TVDB requests across all the shows being processed
+tvdb_semaphore = threading.BoundedSemaphore(TVDB_MAX_WORKERS)
+
+# Set PLEX_LOG=DEBUG to also log the per season progress
+log = logging.getLogger(__name__)
+
 # Flag to handle graceful termination
 terminate = False
 
@@ -41,43 +75,78 @@ terminate = False
 def signal_handler(sig, frame):
     """Handle Ctrl+C to stop processing but still output the report."""
     global terminate
-    safe_print("Interrupt received, finishing current show and generating report...")
+    log.info("Interrupt received, finishing current show and generating report...")
     terminate = True
 
 
 signal.signal(signal.SIGINT, signal_handler)
 
 
-def safe_print(text):
-    """Print text to console with Unicode characters converted to printable form"""
-    if isinstance(text, str):
-        # Replace or remove unprintable characters
-        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
-    print(text)
-
-
 def get_cache_filename(tvdb_id):
     """Generate a cache filename based on the TVDB ID"""
+    return os.path.join(CACHE_DIR, f"tvdb_{tvdb_id}.pkl")
+
+
+def get_legacy_cache_filename(tvdb_id):
+    """Generate the filename used by the older JSON cache format"""
     return os.path.join(CACHE_DIR, f"tvdb_{tvdb_id}.json")
 
 
-def is_cache_valid(cache_file):
-    """Check if the cache file exists and is less than CACHE_EXPIRY_DAYS old"""
-    if not os.path.exists(cache_file):
-        return False
+def read_cache(cache_file):
+    """Load cached TVDB data from disk"""
+    with open(cache_file, "rb") as f:
+        return pickle.load(f)
+
+
+def write_cache(cache_file, show_data):
+    """Save TVDB data to disk, through a temporary file so readers never see a partially written cache"""
+    fd, temp_file = tempfile.mkstemp(dir=CACHE_DIR, prefix="tmp_", suffix=".pkl")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(show_data, f, protocol=5)
+        os.replace(temp_file, cache_file)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+    cache_mtimes[os.path.basename(cache_file)] = time.time()
+
+
+def read_legacy_cache(cache_file):
+    """Load TVDB data from an older JSON cache file"""
+    if orjson:
+        with open(cache_file, "rb") as f:
+            return orjson.loads(f.read())
+    with open(cache_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def migrate_legacy_cache(tvdb_id):
+    """Convert an older JSON cache file to the pickle format, keeping its timestamp"""
+    legacy_file = get_legacy_cache_filename(tvdb_id)
+    cache_file = get_cache_filename(tvdb_id)
+    if os.path.basename(legacy_file) not in cache_mtimes or os.path.basename(cache_file) in cache_mtimes:
+        return
+
+    try:
+        write_cache(cache_file, read_legacy_cache(legacy_file))
+        legacy_stat = os.stat(legacy_file)
+        os.utime(cache_file, (legacy_stat.st_atime, legacy_stat.st_mtime))
+        cache_mtimes[os.path.basename(cache_file)] = legacy_stat.st_mtime
+        os.remove(legacy_file)
+        del cache_mtimes[os.path.basename(legacy_file)]
+    except Exception as e:
+        log.warning("Error migrating legacy cache %s: %s", legacy_file, e)
 
-    file_time = datetime.fromtimestamp(os.path.getmtime(cache_file))
-    expiry_date = datetime.now() - timedelta(days=CACHE_EXPIRY_DAYS)
 
-    return file_time > expiry_date
+def is_cache_valid(cache_file):
+    """Check if the cache file exists and is less than CACHE_EXPIRY_DAYS old"""
+    file_time = cache_mtimes.get(os.path.basename(cache_file))
+    return file_time is not None and file_time > CACHE_EXPIRY_CUTOFF
 
 
-def extract_tvdb_id(guids):
-    """Extract TVDB ID from Plex guid list"""
-    for guid in guids:
-        if "tvdb://" in guid.id:
-            return guid.id.split("//")[1]
-    return None
+def extract_guid_ids(guids):
+    """Extract the provider IDs from Plex guid list, keyed by provider (tvdb, imdb, tmdb)"""
+    return {match.group(1): match.group(2) for guid in guids if (match := GUID_PATTERN.match(guid.id))}
 
 
 def setup_worksheets():
@@ -127,17 +196,44 @@ def setup_worksheets():
     error_sheet.freeze_panes(1, 0)
 
 
-def get_tvdb_data(tvdb_client, show_title, show_year, tvdb_id=None, plex_library=None):
-    """Get TV show data from TVDB, either by ID or search"""
-    safe_print(f"Processing {show_title} ({show_year}) from library '{plex_library}'")
+def is_official_season(season):
+    """Check if a TVDB season belongs to the official (aired) order, seasons without a type count as official"""
+    season_type = season.get("type")
+    return not season_type or not season_type.get("type") or season_type["type"] == "official"
+
+
+def count_official_seasons(series_data):
+    """Count the official seasons of a TVDB series"""
+    return sum(1 for season in series_data.get("seasons", []) if is_official_season(season))
+
+
+def call_tvdb(request, *args):
+    """Run a TVDB client request, retrying with exponential backoff when it fails
+
+    tvdb_v4_official turns every HTTP error (including 429 rate limiting) into a
+    ValueError, so all failures are retried, up to TVDB_MAX_RETRIES attempts.
+    """
+    for attempt in range(TVDB_MAX_RETRIES):
+        try:
+            with tvdb_semaphore:
+                return request(*args)
+        except ValueError:
+            if attempt == TVDB_MAX_RETRIES - 1:
+                raise
+        time.sleep(2**attempt)
+
+
+def get_tvdb_data(tvdb_client, show_title, show_year, tvdb_id=None, plex_library=None, memoize=False):
+    """Get TV show data from TVDB, either by ID or search, memoize keeps the loaded show in memory"""
+    log.info("Processing %s (%s) from library '%s'", show_title, show_year, plex_library)
 
     if not tvdb_id:
         # Search by title
-        safe_print(f"TVDB ID not found in Plex, searching by title: {show_title}")
+        log.info("TVDB ID not found in Plex, searching by title: %s", show_title)
         try:
             search_results = tvdb_client.search(show_title, type="series")
             if not search_results:
-                safe_print(f"No results found on TVDB for {show_title}")
+                log.warning("No results found on TVDB for %s", show_title)
                 return None, "Not found on TVDB"
 
             # Try to find the best match considering year
@@ -153,75 +249,96 @@ def get_tvdb_data(tvdb_client, show_title, show_year, tvdb_id=None, plex_library
 
             if best_match:
                 tvdb_id = best_match.get("tvdb_id")
-                safe_print(f"Found TVDB match: {best_match.get('name')} (ID: {tvdb_id})")
+                log.info("Found TVDB match: %s (ID: %s)", best_match.get("name"), tvdb_id)
             else:
-                safe_print(f"No suitable match found on TVDB for {show_title}")
+                log.warning("No suitable match found on TVDB for %s", show_title)
                 return None, "No suitable match found"
         except Exception as e:
             error_msg = f"TVDB search error: {str(e)}"
-            safe_print(error_msg)
+            log.warning(error_msg)
             return None, error_msg
 
+    try:
+        load_show = load_tvdb_show_memoized if memoize else load_tvdb_show
+        return load_show(tvdb_client, str(tvdb_id)), None
+    except Exception as e:
+        error_msg = f"TVDB API error: {str(e)}"
+        log.warning(error_msg)
+        return None, error_msg
+
+
+def load_tvdb_show(tvdb_client, tvdb_id):
+    """Load a TV show from the disk cache or the TVDB API, raises if it cannot be fetched"""
+    migrate_legacy_cache(tvdb_id)
     cache_file = get_cache_filename(tvdb_id)
 
     if is_cache_valid(cache_file):
-        safe_print(f"Using cached data for {show_title} (TVDB ID: {tvdb_id})")
+        log.debug("Using cached data for TVDB ID: %s", tvdb_id)
         try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                show_data = json.load(f)
-            return show_data, None
+            show_data = read_cache(cache_file)
+            if "num_official_seasons" not in show_data:
+                # Older cache files do not have the count, it only depends on the cached series data
+                show_data["num_official_seasons"] = count_official_seasons(show_data["series"])
+            return show_data
         except Exception as e:
-            safe_print(f"Error reading cache: {str(e)}")
+            log.warning("Error reading cache: %s", e)
             # Fall through to fetch new data
 
     # Fetch new data from TVDB
-    try:
-        safe_print(f"Fetching series extended data for {show_title} (TVDB ID: {tvdb_id}) from TVDB API")
-        series_data = tvdb_client.get_series_extended(tvdb_id)
+    log.debug("Fetching series extended data for TVDB ID: %s from TVDB API", tvdb_id)
+    series_data = call_tvdb(tvdb_client.get_series_extended, tvdb_id)
 
-        # Get details for each season
-        show_data = {"series": series_data, "seasons": []}
+    # Get details for each season
+    show_data = {"series": series_data, "seasons": [], "num_official_seasons": count_official_seasons(series_data)}
 
+    # Fetch the seasons concurrently, the results are collected in the original order
+    with ThreadPoolExecutor(max_workers=TVDB_MAX_WORKERS) as executor:
+        season_futures = []
         for season in series_data.get("seasons", []):
-            if season["type"] and season["type"]["type"] and season["type"]["type"] != "official":
-                print(f"Skipping details, season type = '{season['type']['type']}' ..")
+            if not is_official_season(season):
+                log.debug("Skipping details, season type = '%s' ..", season["type"]["type"])
                 continue
 
             season_num = season.get("number")
-            safe_print(f"Fetching episodes for Season {season_num} of {show_title} (TVDB ID: {tvdb_id})")
+            log.debug("Fetching episodes for Season %s of TVDB ID: %s", season_num, tvdb_id)
+            season_futures.append((season_num, executor.submit(call_tvdb, tvdb_client.get_season_extended, season.get("id"))))
+
+        for season_num, future in season_futures:
             try:
-                season_extended = tvdb_client.get_season_extended(season.get("id"))
-                show_data["seasons"].append(season_extended)
+                show_data["seasons"].append(future.result())
             except Exception as e:
-                safe_print(f"Error fetching season {season_num} data: {str(e)}")
+                log.warning("Error fetching season %s data: %s", season_num, e)
 
-        # Save to cache
-        with open(cache_file, "w", encoding="utf-8") as f:
-            json.dump(show_data, f)
+    # Save to cache
+    write_cache(cache_file, show_data)
+
+    return show_data
+
+
+# Shows that appear in more than one library are only loaded once. Failures raise, so they are not memoized.
+load_tvdb_show_memoized = functools.lru_cache(maxsize=TVDB_MEMORY_CACHE_SIZE)(load_tvdb_show)
 
-        return show_data, None
-    except Exception as e:
-        error_msg = f"TVDB API error: {str(e)}"
-        safe_print(error_msg)
-        return None, error_msg
 
+def process_show(show, plex_library_title, tvdb_client, memoize_tvdb=False):
+    """Process a single TV show, returns the report rows and the error row (if any)
 
-def process_show(show, plex_library_title, tvdb_client, row_index):
-    """Process a single TV show and update the report"""
+    This runs in worker threads, so it must not touch the workbook: the rows are
+    written by write_show_results on the main thread.
+    """
     show_title = show.title
     show_year = getattr(show, "year", "")
 
-    safe_print(f"\nProcessing show: {show_title} ({show_year}) from library '{plex_library_title}'")
+    log.info("\nProcessing show: %s (%s) from library '%s'", show_title, show_year, plex_library_title)
 
     # Extract TVDB ID from Plex
     tvdb_id = None
     if hasattr(show, "guids") and show.guids:
-        tvdb_id = extract_tvdb_id(show.guids)
+        tvdb_id = extract_guid_ids(show.guids).get("tvdb")
         if tvdb_id:
-            safe_print(f"Found TVDB ID in Plex: {tvdb_id}")
+            log.debug("Found TVDB ID in Plex: %s", tvdb_id)
 
     # Get TVDB data
-    tvdb_data, error = get_tvdb_data(tvdb_client, show_title, show_year, tvdb_id, plex_library_title)
+    tvdb_data, error = get_tvdb_data(tvdb_client, show_title, show_year, tvdb_id, plex_library_title, memoize_tvdb)
 
     if error:
         # Add to error sheet
@@ -232,95 +349,65 @@ def process_show(show, plex_library_title, tvdb_client, row_index):
             sheet = error_sheet
             sheet_name = "TVERR"
 
-        # Find the next empty row in the error sheet
-        error_row = 1
-        # while sheet.get_cell(error_row, 0).value is not None:
-        #    error_row += 1
-
-        sheet.write_string(error_row, 0, plex_library_title)
-        sheet.write_string(error_row, 1, show_title)
-        sheet.write(error_row, 2, show_year)
-        sheet.write_string(error_row, 3, error)
-
-        safe_print(f"Added {show_title} to {sheet_name} sheet due to error: {error}")
-        return row_index
+        log.warning("Added %s to %s sheet due to error: %s", show_title, sheet_name, error)
+        return [], (sheet, (plex_library_title, show_title, show_year, error))
 
     # Get Plex episodes
-    plex_episodes = {}
-    plex_episodes_count = {}
+    plex_episodes = defaultdict(dict)
+    plex_episodes_count = defaultdict(lambda: defaultdict(int))
+    plex_episode_files = defaultdict(list)  # file paths of all the copies, keyed by (season, episode)
 
     try:
         # Note: No .refresh() call as specified in requirements
-        safe_print(f"Fetching episodes for {show_title} from Plex API")
+        log.debug("Fetching episodes for %s from Plex API", show_title)
         episodes = show.episodes()
 
         for episode in episodes:
             season_num = episode.seasonNumber
             episode_num = episode.index
-
-            if season_num not in plex_episodes:
-                plex_episodes[season_num] = {}
-                plex_episodes_count[season_num] = {}
+            has_locations = bool(getattr(episode, "locations", None))
 
             for media_part in episode.iterParts():
-                episode_file_path = str(Path(media_part.file.replace("\\?\\", "")).absolute())
+                episode_file_path = os.path.abspath(media_part.file.replace("\\?\\", ""))
 
                 # Track episodes for duplicate detection
-                if episode_num not in plex_episodes_count[season_num]:
-                    plex_episodes_count[season_num][episode_num] = 1
-                else:
-                    plex_episodes_count[season_num][episode_num] += 1
-
-                # If this is a duplicate, append to existing entry
-                if episode_num in plex_episodes[season_num]:
-                    existing_ep = plex_episodes[season_num][episode_num]
-
-                    # Combine file paths
-                    if hasattr(episode, "locations") and episode.locations:
-                        if hasattr(existing_ep, "combined_locations"):
-                            existing_ep.combined_locations.extend([episode_file_path])
-                        else:
-                            existing_ep.combined_locations = [episode_file_path]
-                else:
-                    # Store the episode
-                    plex_episodes[season_num][episode_num] = episode
-
-                    # Initialize combined_locations if needed
-                    if hasattr(episode, "locations") and episode.locations:
-                        episode.combined_locations = [episode_file_path]
-
-        safe_print(f"Finished fetching episodes for {show_title} from Plex API")
+                plex_episodes_count[season_num][episode_num] += 1
+
+                # Store the first copy of the episode, the file paths of all copies are combined
+                plex_episodes[season_num].setdefault(episode_num, episode)
+                if has_locations:
+                    plex_episode_files[(season_num, episode_num)].append(episode_file_path)
+
+        log.debug("Finished fetching episodes for %s from Plex API", show_title)
     except Exception as e:
-        safe_print(f"Error fetching Plex episodes: {str(e)}")
+        log.warning("Error fetching Plex episodes: %s", e)
 
-    # Process TVDB data and compare with Plex
-    series_data = tvdb_data.get("series", {})
-    tvdb_seasons = tvdb_data.get("seasons", [])
+    # (season, episode) pairs found in Plex, and the ones with more than one file
+    plex_keys = frozenset((season_num, episode_num) for season_num, season_episodes in plex_episodes.items() for episode_num in season_episodes)
+    duplicate_keys = frozenset(
+        (season_num, episode_num) for season_num, season_counts in plex_episodes_count.items() for episode_num, count in season_counts.items() if count > 1
+    )
 
-    # Count total seasons from TVDB
-    official_seasons = [s for s in series_data.get("seasons", []) if s.get("type") is None or s.get("type") == "official"]
-    num_seasons = len(official_seasons)
+    # Process TVDB data and compare with Plex
+    # Seasons in number order, seasons without a number are listed last instead of failing the comparison with None
+    tvdb_seasons = sorted(tvdb_data.get("seasons", []), key=lambda season: (season.get("number") is None, season.get("number") or 0))
+    num_seasons = tvdb_data["num_official_seasons"]
 
     # Process each season from TVDB
+    episode_rows = []
     for season_data in tvdb_seasons:
         season_num = season_data.get("number")
         season_name = season_data.get("name", "")
         episodes = season_data.get("episodes", [])
 
         if not episodes:
-            safe_print(f"Skipping Season {season_num} of {show_title} - 'episodes' is missing!")
+            log.warning("Skipping Season %s of %s - 'episodes' is missing!", season_num, show_title)
             continue
 
-        safe_print(f"Processing Season {season_num} of {show_title} ({len(episodes)} episodes)")
-
-        is_season_missing = True
+        log.debug("Processing Season %s of %s (%s episodes)", season_num, show_title, len(episodes))
 
-        for episode in episodes:
-            if season_num in plex_episodes and episode_num in plex_episodes[season_num]:
-                # if there is at least one episode for the season, then the season is not missing, so we might have holes in the episodes
-                if is_season_missing:
-                    is_season_missing = False
-                    break
+        # if there is at least one episode for the season, then the season is not missing, so we might have holes in the episodes
+        is_season_missing = not any((season_num, episode.get("number")) in plex_keys for episode in episodes)
 
         for episode in episodes:
             episode_num = episode.get("number")
@@ -332,113 +419,148 @@ def process_show(show, plex_library_title, tvdb_client, row_index):
                 air_date = ""
 
             # Check if this episode exists in Plex
-            is_episode_missing = True
-            is_duplicate = False
+            episode_key = (season_num, episode_num)
+            is_episode_missing = episode_key not in plex_keys
+            is_duplicate = episode_key in duplicate_keys
             file_path = ""
 
-            if season_num in plex_episodes and episode_num in plex_episodes[season_num]:
-                is_episode_missing = False
-
-                plex_episode = plex_episodes[season_num][episode_num]
-
-                # Check for duplicates
-                if season_num in plex_episodes_count and episode_num in plex_episodes_count[season_num]:
-                    is_duplicate = plex_episodes_count[season_num][episode_num] > 1
-
+            if not is_episode_missing:
                 # Get file path(s)
-                if hasattr(plex_episode, "combined_locations") and plex_episode.combined_locations:
-                    file_path = "\n".join(plex_episode.combined_locations)
-                elif hasattr(plex_episode, "locations") and plex_episode.locations:  # this should never be ?
-                    file_path = "\n".join(plex_episode.locations)
-
-            # Write to the main sheet using appropriate write methods
-            main_sheet.write_string(row_index, 0, plex_library_title)
-            main_sheet.write_string(row_index, 1, show_title)
-            main_sheet.write(row_index, 2, show_year)
-            main_sheet.write(row_index, 3, num_seasons)
-            main_sheet.write(row_index, 4, season_num)
-            main_sheet.write_string(row_index, 5, season_name)
-            main_sheet.write(row_index, 6, len(episodes))
-            main_sheet.write(row_index, 7, episode_num)
-            main_sheet.write(row_index, 8, air_date)
-            main_sheet.write_boolean(row_index, 9, is_episode_missing)
-            main_sheet.write_boolean(row_index, 10, is_season_missing)
-            main_sheet.write_boolean(row_index, 11, is_duplicate)
-            main_sheet.write_string(row_index, 12, episode_title)
-            main_sheet.write_string(row_index, 13, file_path)
-
-            row_index += 1
-
-    return row_index
+                if episode_key in plex_episode_files:
+                    file_path = "\n".join(plex_episode_files[episode_key])
+                else:  # this should never be ?
+                    file_path = "\n".join(getattr(plex_episodes[season_num][episode_num], "locations", None) or ())
+
+            episode_rows.append(
+                (
+                    plex_library_title,
+                    show_title,
+                    show_year,
+                    num_seasons,
+                    season_num,
+                    season_name,
+                    len(episodes),
+                    episode_num,
+                    air_date,
+                    is_episode_missing,
+                    is_season_missing,
+                    is_duplicate,
+                    episode_title,
+                    file_path,
+                )
+            )
+
+    return episode_rows, None
+
+
+def write_show_results(episode_rows, error_result, row_index):
+    """Write the results of process_show to the report, returns the next free row in the main sheet"""
+    if error_result:
+        sheet, error_values = error_result
+        sheet.write_row(next(error_row_counters[sheet]), 0, error_values)
+
+    # write() picks the cell type from the value, so booleans and numbers keep their types
+    write_row = main_sheet.write_row
+    for row, episode_values in enumerate(episode_rows, start=row_index):
+        write_row(row, 0, episode_values)
+
+    return row_index + len(episode_rows)
 
 
 def main():
     """Main function to generate the Plex episodes report"""
-    safe_print("Starting Plex TV Shows Episode Report Generator")
+    # Replace unprintable characters once here instead of normalizing every printed line
+    try:
+        sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    except AttributeError:
+        pass
+
+    log_level_name = (os.environ.get("PLEX_LOG") or "INFO").upper()
+    log_level = logging.getLevelName(log_level_name)
+    logging.basicConfig(level=log_level if isinstance(log_level, int) else logging.INFO, stream=sys.stdout, format="%(message)s")
+    if not isinstance(log_level, int):
+        log.warning("Unknown PLEX_LOG level '%s', using INFO", log_level_name)
+
+    log.info("Starting Plex TV Shows Episode Report Generator")
 
     # Set up worksheets
     setup_worksheets()
 
     try:
         # Connect to Plex
-        safe_print(f"Connecting to Plex server at {PLEX_URL}")
+        log.info("Connecting to Plex server at %s", PLEX_URL)
         plex = PlexServer(PLEX_URL, PLEX_TOKEN)
-        safe_print(f"Successfully connected to Plex server")
+        log.info("Successfully connected to Plex server")
 
         # Connect to TVDB
-        safe_print("Connecting to TVDB API")
+        log.info("Connecting to TVDB API")
         tvdb = tvdb_v4_official.TVDB(TVDB_APIKEY)
-        safe_print("Successfully connected to TVDB API")
+        log.info("Successfully connected to TVDB API")
 
         # Get all TV libraries
-        safe_print("Fetching Plex libraries")
+        log.debug("Fetching Plex libraries")
         libraries = [section for section in plex.library.sections() if section.type == "show" and LIBRARY_TITLE_FILTER.match(section.title)]
-        safe_print(f"Finished fetching Plex libraries")
+        log.debug("Finished fetching Plex libraries")
 
         if not libraries:
-            safe_print("No TV libraries found that start with 'TV '")
+            log.info("No TV libraries found that start with 'TV '")
             wb.close()
             return
 
-        safe_print(f"Found {len(libraries)} TV libraries to process")
+        log.info("Found %s TV libraries to process", len(libraries))
+
+        # Loaded shows are only worth keeping when they can appear again in another library
+        memoize_tvdb = len(libraries) > 1
 
         row_index = 1  # Start after headers
 
         # Process each library
         for library in libraries:
             library_title = library.title
-            safe_print(f"\nProcessing library: {library_title}")
+            log.info("\nProcessing library: %s", library_title)
 
             # Get all shows in this library
-            safe_print(f"Fetching all shows from library: {library_title}")
+            log.debug("Fetching all shows from library: %s", library_title)
             shows = library.search()
-            safe_print(f"Finished fetching shows from library: {library_title}")
+            log.debug("Finished fetching shows from library: %s", library_title)
 
-            safe_print(f"Found {len(shows)} shows in library: {library_title}")
+            log.info("Found %s shows in library: %s", len(shows), library_title)
 
-            for show in shows:
-                if terminate:
-                    safe_print("Terminating early due to user interrupt")
-                    break
+            # Process the shows concurrently, the results are written in the original order and
+            # each future is dropped once written so its rows are not kept until the library is done
+            with ThreadPoolExecutor(max_workers=SHOW_MAX_WORKERS) as executor:
+                show_futures = deque(executor.submit(process_show, show, library_title, tvdb, memoize_tvdb) for show in shows)
+
+                cancelled = False
+                while show_futures:
+                    future = show_futures.popleft()
+                    if terminate and not cancelled:
+                        # Drop the shows not started yet, the running ones still finish and are written
+                        log.info("Terminating early due to user interrupt")
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        cancelled = True
+
+                    if future.cancelled():
+                        continue
 
-                try:
-                    row_index = process_show(show, library_title, tvdb, row_index)
-                except Exception as e1:
-                    safe_print(f"Error (I): {str(e1)}")
-                    print(e1)
+                    try:
+                        row_index = write_show_results(*future.result(), row_index)
+                    except Exception as e1:
+                        log.error("Error (I): %s", e1)
+                        log.debug("Error (I) details", exc_info=True)
 
             if terminate:
                 break
 
     except Exception as e:
-        safe_print(f"Error (O): {str(e)}")
-        print(e)
+        log.error("Error (O): %s", e)
+        log.debug("Error (O) details", exc_info=True)
 
     finally:
         # Save the workbook
-        safe_print("Saving report to plex-episodes-report.xlsx")
+        log.info("Saving report to plex-episodes-report.xlsx")
         wb.close()
-        safe_print("Report generation complete")
+        log.info("Report generation complete")
 
 
 if __name__ == "__main__":